@@ -7,6 +7,9 @@
 import os
 import sys
 import json
+import logging
+import shutil
+import subprocess
 import threading
 from pathlib import Path
 from typing import Optional
@@ -25,6 +28,8 @@ except ImportError:
     print("錯誤：請先安裝 customtkinter")
     sys.exit(1)
 
+from tkinter import filedialog, messagebox
+
 # 導入本地模組
 from model_downloader import ModelDownloader
 from transcription_core import TranscriptionCore
@@ -33,6 +38,9 @@ from transcription_core import TranscriptionCore
 APP_NAME = "語音轉錄工具"
 APP_VERSION = "1.1.0"
 
+# 音訊語言選單：顯示名稱 → Whisper 語言代碼
+LANGUAGE_OPTIONS = {"中文": "zh", "英文": "en", "日文": "ja", "自動偵測": "auto"}
+
 
 def get_settings_path() -> Path:
     """取得設定檔路徑"""
@@ -66,6 +74,10 @@ class VoiceTranscriberApp(ctk.CTk):
         self.transcription_core = TranscriptionCore()
         self.model_downloader = ModelDownloader()
         
+        # 背景執行緒送來的進度更新（合併後交由主執行緒套用）
+        self._pending_status = None
+        self._status_lock = threading.Lock()
+        
         # 選項
         self.output_srt = ctk.BooleanVar(value=True)
         self.output_txt = ctk.BooleanVar(value=False)
@@ -131,7 +143,7 @@ class VoiceTranscriberApp(ctk.CTk):
         lang_frame.pack(side="left")
         ctk.CTkLabel(lang_frame, text="音訊語言", font=ctk.CTkFont(size=11)).pack(side="left", padx=(0,5))
         self.lang_menu = ctk.CTkOptionMenu(
-            lang_frame, values=["中文", "英文", "日文", "自動偵測"],
+            lang_frame, values=list(LANGUAGE_OPTIONS),
             width=90, height=28, font=ctk.CTkFont(size=11),
             fg_color="#0f3460", button_color="#1a4a7a",
             command=self._on_lang_change
@@ -261,7 +273,6 @@ class VoiceTranscriberApp(ctk.CTk):
             self.uninstall_btn.pack(side="right", padx=10)
     
     def _select_file(self):
-        from tkinter import filedialog
         path = filedialog.askopenfilename(
             filetypes=[("媒體檔案", "*.mp3 *.wav *.m4a *.mp4 *.mov *.mkv *.avi"), ("所有", "*.*")]
         )
@@ -271,7 +282,7 @@ class VoiceTranscriberApp(ctk.CTk):
             self.file_label.configure(text=name[:45] + "..." if len(name) > 45 else name, text_color="#4CAF50")
     
     def _on_lang_change(self, choice):
-        self.language_var.set({"中文": "zh", "英文": "en", "日文": "ja", "自動偵測": "auto"}.get(choice, "zh"))
+        self.language_var.set(LANGUAGE_OPTIONS.get(choice, "zh"))
     
     def _check_model(self):
         if self.model_downloader.is_model_available():
@@ -281,7 +292,6 @@ class VoiceTranscriberApp(ctk.CTk):
     
     def _start(self):
         if not self.selected_file:
-            from tkinter import messagebox
             messagebox.showwarning("提示", "請先選擇檔案")
             return
         if self.is_transcribing:
@@ -295,9 +305,18 @@ class VoiceTranscriberApp(ctk.CTk):
         self.progress.set(0)
         self.status.configure(text="處理中...")
         
-        threading.Thread(target=self._transcribe, daemon=True).start()
+        # 在主執行緒一次讀取所有選項，背景執行緒不再存取 Tk 變數
+        options = dict(
+            input_file=self.selected_file,
+            language=self.language_var.get(),
+            prompt=self.prompt_var.get(),  # 自訂詞彙
+            output_srt=self.output_srt.get(),
+            output_txt=self.output_txt.get(),
+            convert_traditional=self.convert_traditional.get(),
+        )
+        threading.Thread(target=self._transcribe, args=(options,), daemon=True).start()
     
-    def _transcribe(self):
+    def _transcribe(self, options: dict):
         try:
             if not self.model_downloader.is_model_available():
                 self._set_status(0.05, "下載模型中...")
@@ -308,13 +327,8 @@ class VoiceTranscriberApp(ctk.CTk):
             self._set_status(0.30, "轉錄中，請稍候...")
             
             result = self.transcription_core.transcribe(
-                input_file=self.selected_file,
-                language=self.language_var.get(),
-                prompt=self.prompt_var.get(),  # 自訂詞彙
-                output_srt=self.output_srt.get(),
-                output_txt=self.output_txt.get(),
+                **options,
                 output_vtt=False,
-                convert_traditional=self.convert_traditional.get(),
                 # 音訊轉換部分已經沒有進度回報，所以從 0.1 開始轉錄
                 progress_callback=lambda p: self._set_status(0.1 + p * 0.9, f"轉錄中 {int((0.1+p*0.9)*100)}%")
             )
@@ -336,11 +350,22 @@ class VoiceTranscriberApp(ctk.CTk):
             if p < self._max_progress:
                 return  # 忽略較小的進度值
             self._max_progress = p
-        self.after(0, lambda: self.progress.set(p))
-        self.after(0, lambda: self.status.configure(text=t))
+        # 轉錄輸出每行都可能回報進度，只保留最新一筆，閒置時一次套用
+        with self._status_lock:
+            schedule = self._pending_status is None
+            self._pending_status = (p, t)
+        if schedule:
+            self.after_idle(self._apply_status)
+    
+    def _apply_status(self):
+        with self._status_lock:
+            status, self._pending_status = self._pending_status, None
+        if status:
+            p, t = status
+            self.progress.set(p)
+            self.status.configure(text=t)
     
     def _done(self, path):
-        from tkinter import messagebox
         messagebox.showinfo("完成", f"輸出：\n{path}")
     
     def _reset(self):
@@ -404,10 +429,6 @@ class VoiceTranscriberApp(ctk.CTk):
     
     def _complete_uninstall(self):
         """完整移除程式（僅 macOS）"""
-        from tkinter import messagebox
-        import subprocess
-        import shutil
-        
         # 確認對話框
         result = messagebox.askyesno(
             "完整移除程式",
@@ -447,4 +468,7 @@ class VoiceTranscriberApp(ctk.CTk):
 
 
 if __name__ == "__main__":
+    # 設定環境變數 VOICE_TRANSCRIBER_DEBUG 時輸出除錯日誌（資源路徑、FFmpeg/Whisper 命令等）
+    if os.environ.get("VOICE_TRANSCRIBER_DEBUG"):
+        logging.basicConfig(level=logging.DEBUG)
     VoiceTranscriberApp().mainloop()
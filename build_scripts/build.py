@@ -8,6 +8,8 @@ import os
 import sys
 import shutil
 import subprocess
+import importlib.util
+import importlib.metadata
 from pathlib import Path
 import platform
 
@@ -30,6 +32,9 @@ class AppBuilder:
         self.dist_dir = self.project_root / "dist"
         self.resources_dir = self.project_root / "whisper_resources"
         
+        # 目前作業系統（只查詢一次）
+        self.system = platform.system()
+        
         # 主程式檔案
         self.main_script = self.project_root / "app_main.py"
         
@@ -55,15 +60,19 @@ class AppBuilder:
     
     def check_pyinstaller(self):
         """檢查 PyInstaller 是否安裝"""
-        try:
-            import PyInstaller
-            print(f"✅ PyInstaller 版本：{PyInstaller.__version__}")
-            return True
-        except ImportError:
-            print("❌ PyInstaller 未安裝")
-            print("正在安裝 PyInstaller...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        # 只查詢套件資訊，不實際載入 PyInstaller
+        if importlib.util.find_spec("PyInstaller") is not None:
+            try:
+                version = importlib.metadata.version("pyinstaller")
+            except importlib.metadata.PackageNotFoundError:
+                version = "未知"
+            print(f"✅ PyInstaller 版本：{version}")
             return True
+        
+        print("❌ PyInstaller 未安裝")
+        print("正在安裝 PyInstaller...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        return True
     
     def clean_build(self):
         """清理舊的建置檔案"""
@@ -83,7 +92,7 @@ class AppBuilder:
         """建置 Windows 版本"""
         self.print_header("建置 Windows 版本")
         
-        if platform.system() != "Windows":
+        if self.system != "Windows":
             print("⚠️ 警告：非 Windows 系統，跳過 Windows 建置")
             print("  請在 Windows 系統上執行此腳本以建置 Windows 版本")
             return False
@@ -94,7 +103,7 @@ class AppBuilder:
         """建置 macOS 版本"""
         self.print_header("建置 macOS 版本")
         
-        if platform.system() != "Darwin":
+        if self.system != "Darwin":
             print("⚠️ 警告：非 macOS 系統，跳過 macOS 建置")
             print("  請在 macOS 系統上執行此腳本以建置 macOS 版本")
             return False
@@ -196,7 +205,7 @@ class AppBuilder:
     
     def create_dmg(self):
         """建立 macOS DMG 安裝包"""
-        if platform.system() != "Darwin":
+        if self.system != "Darwin":
             print("⚠️ 只能在 macOS 上建立 DMG")
             return False
         
@@ -210,7 +219,6 @@ class AppBuilder:
             return False
         
         # 建立臨時資料夾，將 .app 放入其中
-        import shutil
         temp_dmg_dir = self.dist_dir / "dmg_temp"
         if temp_dmg_dir.exists():
             shutil.rmtree(temp_dmg_dir)
@@ -255,7 +263,7 @@ class AppBuilder:
         self.clean_build()
         
         # 根據平台建置
-        current_platform = platform.system()
+        current_platform = self.system
         
         if current_platform == "Darwin":
             success = self.build_macos()
@@ -3,11 +3,14 @@
 從 Hugging Face 下載 Whisper ggml-large-v2.bin 模型
 """
 
+import hashlib
 import os
+import re
 import sys
+import urllib.error
 import urllib.request
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 
 
 class ModelDownloader:
@@ -17,6 +20,9 @@ class ModelDownloader:
     MODEL_URL = "https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-large-v2.bin"
     MODEL_NAME = "ggml-large-v2.bin"
     MODEL_SIZE = 3_094_623_691  # 約 3GB
+    # Hugging Face 上該檔案的 LFS SHA-256
+    MODEL_SHA256 = "9a423fe4d40c82774b6af34115b8b935f34152246eb19e80e376071d3f999487"
+    CHUNK_SIZE = 4 * 1024 * 1024  # 4MB chunks
     
     def __init__(self):
         """初始化下載器"""
@@ -72,50 +78,179 @@ class ModelDownloader:
         temp_path = self.model_path.with_suffix('.tmp')
         
         try:
-            # 建立下載請求
-            request = urllib.request.Request(
-                self.MODEL_URL,
-                headers={'User-Agent': 'Mozilla/5.0 (Whisper Transcriber)'}
-            )
-            
-            with urllib.request.urlopen(request, timeout=30) as response:
-                total_size = int(response.headers.get('Content-Length', self.MODEL_SIZE))
-                downloaded = 0
-                chunk_size = 1024 * 1024  # 1MB chunks
-                
-                with open(temp_path, 'wb') as f:
-                    while True:
-                        chunk = response.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if progress_callback:
-                            progress = downloaded / total_size
-                            progress_callback(min(progress, 1.0))
-                        
-                        # 顯示進度
-                        progress_pct = (downloaded / total_size) * 100
-                        downloaded_mb = downloaded / 1024 / 1024
-                        total_mb = total_size / 1024 / 1024
-                        print(f"\r下載進度：{progress_pct:.1f}% ({downloaded_mb:.0f}/{total_mb:.0f} MB)", end="")
+            self._download_to_temp(temp_path, progress_callback)
             
             print()  # 換行
             
             # 重命名臨時檔案
             temp_path.rename(self.model_path)
+            self._etag_path(temp_path).unlink(missing_ok=True)
             print(f"模型下載完成：{self.model_path}")
             return True
             
         except Exception as e:
             print(f"\n下載失敗：{e}")
-            # 清理臨時檔案
-            if temp_path.exists():
-                temp_path.unlink()
+            # 保留臨時檔案，下次下載時從中斷處續傳
             raise RuntimeError(f"模型下載失敗：{e}")
     
+    def _download_to_temp(
+        self,
+        temp_path: Path,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ):
+        """
+        將模型下載到暫存檔
+        
+        暫存檔已有內容時（上次下載中斷），以 HTTP Range 請求從其結尾續傳，
+        並以 If-Range 帶上次的 ETag，伺服器上的檔案已更換時會改回傳完整檔案；
+        沒有 ETag、伺服器不支援續傳或回傳的區段接不上時則從頭下載。
+        下載的同時計算 SHA-256，完成後與 MODEL_SHA256 比對，不符時刪除暫存檔。
+        """
+        etag_path = self._etag_path(temp_path)
+        resume_from = temp_path.stat().st_size if temp_path.exists() else 0
+        etag = etag_path.read_text().strip() if resume_from and etag_path.exists() else ''
+        if not etag:
+            # 無法確認伺服器上的檔案與暫存檔是同一版本，不續傳
+            resume_from = 0
+        
+        # 建立下載請求
+        headers = {'User-Agent': 'Mozilla/5.0 (Whisper Transcriber)'}
+        if resume_from:
+            headers['Range'] = f'bytes={resume_from}-'
+            headers['If-Range'] = etag
+        request = urllib.request.Request(self.MODEL_URL, headers=headers)
+        
+        try:
+            response = urllib.request.urlopen(request, timeout=30)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and resume_from:
+                # 416：續傳起點超出檔案範圍，僅當暫存檔大小恰等於檔案總長才算已下載完整
+                _, total = self._parse_content_range(e.headers.get('Content-Range'))
+                e.close()
+                if total == resume_from:
+                    hasher = hashlib.sha256()
+                    self._hash_file(temp_path, hasher, bytearray(self.CHUNK_SIZE))
+                    self._verify_digest(temp_path, hasher)
+                    return
+                print("暫存檔與伺服器上的檔案大小不符，重新下載")
+                self._discard_temp(temp_path)
+                return self._download_to_temp(temp_path, progress_callback)
+            raise
+        
+        # 重複使用同一塊緩衝區接收資料，避免每個區塊都配置新的 bytes
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        hasher = hashlib.sha256()
+        
+        with response:
+            if resume_from and response.status == 206:
+                start, _ = self._parse_content_range(response.headers.get('Content-Range'))
+                if start != resume_from:
+                    # 回傳的區段不是從暫存檔結尾開始，無法接上
+                    response.close()
+                    print("伺服器回傳的續傳區段不符，重新下載")
+                    self._discard_temp(temp_path)
+                    return self._download_to_temp(temp_path, progress_callback)
+                downloaded = resume_from
+                mode = 'ab'
+                print(f"從 {resume_from / 1024 / 1024:.0f} MB 處繼續下載")
+                # 續傳時先將已下載的部分計入雜湊
+                self._hash_file(temp_path, hasher, buffer)
+            else:
+                downloaded = 0
+                mode = 'wb'
+                # 記下這次下載的 ETag 供日後續傳時比對（弱 ETag 不能用於 If-Range）
+                new_etag = response.headers.get('ETag', '')
+                if new_etag and not new_etag.startswith('W/'):
+                    etag_path.write_text(new_etag)
+                else:
+                    etag_path.unlink(missing_ok=True)
+            
+            content_length = response.headers.get('Content-Length')
+            total_size = downloaded + int(content_length) if content_length else self.MODEL_SIZE
+            total_mb = total_size / 1024 / 1024
+            last_percent = -1
+            
+            with open(temp_path, mode) as f:
+                while True:
+                    n = response.readinto(buffer)
+                    if not n:
+                        break
+                    
+                    f.write(view[:n])
+                    hasher.update(view[:n])
+                    downloaded += n
+                    
+                    # 進度每 1% 才回報一次（約 30MB，數個區塊），避免每個區塊都更新 UI 與終端機
+                    percent = downloaded * 100 // total_size
+                    if percent == last_percent:
+                        continue
+                    last_percent = percent
+                    
+                    if progress_callback:
+                        progress = downloaded / total_size
+                        progress_callback(min(progress, 1.0))
+                    
+                    # 顯示進度
+                    progress_pct = (downloaded / total_size) * 100
+                    downloaded_mb = downloaded / 1024 / 1024
+                    print(f"\r下載進度：{progress_pct:.1f}% ({downloaded_mb:.0f}/{total_mb:.0f} MB)", end="")
+                
+                # 先確保資料寫入磁碟再重命名，避免當機後留下大小正確但內容不完整的模型
+                f.flush()
+                os.fsync(f.fileno())
+        
+        # 連線提前結束時不可當作完成，保留暫存檔供續傳
+        if content_length and downloaded < total_size:
+            raise RuntimeError(f"下載不完整（{downloaded}/{total_size} bytes）")
+        
+        self._verify_digest(temp_path, hasher)
+    
+    @staticmethod
+    def _hash_file(path: Path, hasher, buffer: bytearray):
+        """以指定緩衝區分塊讀取檔案，更新雜湊"""
+        view = memoryview(buffer)
+        with open(path, 'rb') as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+    
+    def _verify_digest(self, temp_path: Path, hasher):
+        """比對下載內容的 SHA-256，不符時刪除暫存檔（內容已損壞，續傳也無法修復）"""
+        digest = hasher.hexdigest()
+        if digest != self.MODEL_SHA256:
+            self._discard_temp(temp_path)
+            raise RuntimeError(f"模型校驗失敗（SHA-256 {digest}），已刪除暫存檔，請重新下載")
+    
+    @staticmethod
+    def _etag_path(temp_path: Path) -> Path:
+        """取得記錄暫存檔 ETag 的檔案路徑"""
+        return temp_path.with_suffix('.etag')
+    
+    def _discard_temp(self, temp_path: Path):
+        """刪除暫存檔與其 ETag 記錄"""
+        temp_path.unlink(missing_ok=True)
+        self._etag_path(temp_path).unlink(missing_ok=True)
+    
+    @staticmethod
+    def _parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        解析 Content-Range 標頭（bytes 起點-終點/總長 或 bytes */總長）
+        
+        Returns:
+            (起點, 總長)，無法取得的部分為 None
+        """
+        match = re.match(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)', value or '')
+        if not match:
+            return None, None
+        start, total = match.groups()
+        return (
+            int(start) if start is not None else None,
+            int(total) if total != '*' else None,
+        )
+    
     def get_download_size_str(self) -> str:
         """取得下載大小的字串表示"""
         return f"{self.MODEL_SIZE / 1024 / 1024 / 1024:.1f} GB"
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Optional, Dict, List
 import subprocess
 import shutil
+import string
+import tempfile
 
 
 class PlatformAdapter:
@@ -153,7 +155,6 @@ class PlatformAdapter:
     
     def get_temp_dir(self) -> Path:
         """取得臨時檔案目錄"""
-        import tempfile
         temp_dir = Path(tempfile.gettempdir()) / 'AIWorkstation'
         temp_dir.mkdir(parents=True, exist_ok=True)
         return temp_dir
@@ -216,8 +217,6 @@ class FileManager:
     def copy_file(self, source: str, destination: str, 
                  progress_callback: Optional[callable] = None) -> bool:
         """複製檔案，支援進度回調"""
-        import shutil
-        
         try:
             source_path = Path(source)
             dest_path = Path(destination)
@@ -256,8 +255,6 @@ class FileManager:
     
     def move_file(self, source: str, destination: str) -> bool:
         """移動檔案"""
-        import shutil
-        
         try:
             source_path = Path(source)
             dest_path = Path(destination)
@@ -386,7 +383,6 @@ class PathManager:
         if not self.platform_adapter.is_windows():
             return ['/']
         
-        import string
         drives = []
         for letter in string.ascii_uppercase:
             drive = f"{letter}:\\"
@@ -4,12 +4,15 @@
 """
 
 import os
+import re
+import logging
 import sys
+import shutil
 import subprocess
 import threading
 import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Callable, List
+from typing import Dict, Optional, Callable, List, Tuple
 from dataclasses import dataclass
 
 # OpenCC 用於簡繁轉換
@@ -26,6 +29,26 @@ try:
 except ImportError:
     SRT_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# FFmpeg 輸出中的總時長，例如 Duration: 00:01:23.45
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+\.\d+)')
+
+# OpenCC 轉換器快取：載入字典較耗時，首次使用時才建立，並在各實例間共用
+_opencc_converters: Dict[str, object] = {}
+
+
+def _get_opencc_converter(config: str):
+    """取得指定設定的 OpenCC 轉換器，無法使用時回傳 None"""
+    if not OPENCC_AVAILABLE:
+        return None
+    if config not in _opencc_converters:
+        try:
+            _opencc_converters[config] = opencc.OpenCC(config)
+        except Exception:
+            _opencc_converters[config] = None
+    return _opencc_converters[config]
+
 
 @dataclass
 class TranscriptionResult:
@@ -78,25 +101,17 @@ class TranscriptionCore:
         else:
             self.whisper_executable = self.resources_dir / "main"
             self.ffmpeg_executable = self.resources_dir / "ffmpeg"
-        
-        # Debug: 顯示路徑資訊
-        print(f"[DEBUG] 打包資源目錄: {self.resources_dir}")
-        print(f"[DEBUG] 用戶資源目錄: {self.user_resources_dir}")
-        print(f"[DEBUG] 模型路徑: {self.model_path} (存在: {self.model_path.exists()})")
-        print(f"[DEBUG] Whisper執行檔: {self.whisper_executable} (存在: {self.whisper_executable.exists()})")
-        print(f"[DEBUG] FFmpeg: {self.ffmpeg_executable} (存在: {self.ffmpeg_executable.exists()})")
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("打包資源目錄: %s", self.resources_dir)
+            logger.debug("用戶資源目錄: %s", self.user_resources_dir)
+            logger.debug("模型路徑: %s (存在: %s)", self.model_path, self.model_path.exists())
+            logger.debug("Whisper執行檔: %s (存在: %s)", self.whisper_executable, self.whisper_executable.exists())
+            logger.debug("FFmpeg: %s (存在: %s)", self.ffmpeg_executable, self.ffmpeg_executable.exists())
+
         # 取消標記
         self._cancelled = False
         self._process: Optional[subprocess.Popen] = None
-        
-        # OpenCC 轉換器
-        self._opencc_converter = None
-        if OPENCC_AVAILABLE:
-            try:
-                self._opencc_converter = opencc.OpenCC('s2t')  # 簡體轉繁體
-            except Exception:
-                pass
     
     def transcribe(
         self,
@@ -158,7 +173,7 @@ class TranscriptionCore:
         try:
             # 準備音訊檔案（如果是影片則提取音訊）
             # 不傳入 progress_callback 以免進度條亂跳 (例如從 40% 跳回 0%)
-            audio_file = self._prepare_audio(input_path, None)
+            audio_file, total_duration = self._prepare_audio(input_path, None)
             
             if self._cancelled:
                 return TranscriptionResult(
@@ -168,9 +183,10 @@ class TranscriptionCore:
                     error_message="已取消"
                 )
             
-            # 獲取媒體總時長（秒）
-            total_duration = self._get_media_duration(input_path)
-            print(f"[DEBUG] 媒體總時長: {total_duration} 秒")
+            # 獲取媒體總時長（秒），轉換時已從 FFmpeg 輸出取得則不再另外探測
+            if total_duration is None:
+                total_duration = self._get_media_duration(input_path)
+            logger.debug("媒體總時長: %s 秒", total_duration)
             
             # 執行 Whisper 轉錄
             if progress_callback:
@@ -198,9 +214,11 @@ class TranscriptionCore:
             
             # 簡繁轉換
             if convert_traditional and language in ["zh", "auto"]:
-                transcript_text = self._convert_to_traditional(transcript_text)
-                if output_file and Path(output_file).exists():
-                    self._convert_file_to_traditional(output_file)
+                converted_text = self._convert_to_traditional(transcript_text)
+                # transcript_text 就是輸出檔的內容，直接寫回轉換結果，不必重讀再轉一次
+                if output_file and converted_text != transcript_text:
+                    self._write_output_file(output_file, converted_text)
+                transcript_text = converted_text
             
             if progress_callback:
                 progress_callback(1.0)
@@ -224,7 +242,7 @@ class TranscriptionCore:
                 try:
                     if audio_file.exists():
                         audio_file.unlink()
-                        print(f"[DEBUG] 已清理暫存檔: {audio_file}")
+                        logger.debug("已清理暫存檔: %s", audio_file)
                 except Exception:
                     pass  # 忽略清理失敗
 
@@ -232,18 +250,22 @@ class TranscriptionCore:
         self,
         input_path: Path,
         progress_callback: Optional[Callable[[float], None]] = None
-    ) -> Path:
-        """準備音訊檔案"""
+    ) -> Tuple[Path, Optional[float]]:
+        """
+        準備音訊檔案
+        
+        Returns:
+            (音訊檔案路徑, 媒體總時長秒數；未經 FFmpeg 轉換時為 None)
+        """
         suffix = input_path.suffix.lower()
         
         # 如果是 WAV 16kHz，直接使用
         if suffix == '.wav':
-            return input_path
+            return input_path, None
         
         # 需要使用 FFmpeg 轉換
         if not self.ffmpeg_executable.exists():
             # 嘗試使用系統 FFmpeg
-            import shutil
             system_ffmpeg = shutil.which('ffmpeg')
             if system_ffmpeg:
                 self.ffmpeg_executable = Path(system_ffmpeg)
@@ -288,7 +310,8 @@ class TranscriptionCore:
             if progress_callback:
                 progress_callback(0.2)
             
-            return output_wav
+            # FFmpeg 轉換時已在 stderr 印出來源時長，順便取用
+            return output_wav, self._parse_duration(result.stderr)
             
         except subprocess.TimeoutExpired:
             raise RuntimeError("FFmpeg 轉換超時")
@@ -305,17 +328,24 @@ class TranscriptionCore:
             cmd = [str(self.ffmpeg_executable), '-i', str(file_path)]
             result = subprocess.run(cmd, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='ignore', **kwargs)
             
-            # 從輸出中尋找 Duration: 00:00:00.00
-            import re
-            match = re.search(r'Duration: (\d+):(\d+):(\d+\.\d+)', result.stderr)
-            if match:
-                h, m, s = int(match.group(1)), int(match.group(2)), float(match.group(3))
-                return h * 3600 + m * 60 + s
+            duration = self._parse_duration(result.stderr)
+            if duration is not None:
+                return duration
         except Exception as e:
             print(f"[ERROR] 無法獲取時長: {e}")
         
         return 3600.0  # 如果失敗，預設回退到 1 小時
 
+    @staticmethod
+    def _parse_duration(ffmpeg_output: str) -> Optional[float]:
+        """從 FFmpeg 輸出解析總時長（秒），找不到時回傳 None"""
+        # 從輸出中尋找 Duration: 00:00:00.00
+        match = _DURATION_RE.search(ffmpeg_output or "")
+        if match:
+            h, m, s = int(match.group(1)), int(match.group(2)), float(match.group(3))
+            return h * 3600 + m * 60 + s
+        return None
+
     def _run_whisper(
         self,
         audio_file: Path,
@@ -358,7 +388,8 @@ class TranscriptionCore:
         # 音訊檔案放在最後
         cmd.extend(['-f', str(audio_file)])
         
-        print(f"[DEBUG] 執行 Whisper 命令: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("執行 Whisper 命令: %s", ' '.join(cmd))
         
         # Windows 隱藏終端機視窗
         kwargs = {}
@@ -378,34 +409,29 @@ class TranscriptionCore:
                 **kwargs
             )
             
-            transcript_lines = []
+            process = self._process
+            # 迴圈內不會改變的條件先計算好，避免每行重複判斷
+            track_progress = progress_callback is not None and total_duration > 0
             
             # 讀取輸出並解析進度
-            for line in iter(self._process.stdout.readline, ''):
+            for line in iter(process.stdout.readline, ''):
                 if self._cancelled:
-                    self._process.terminate()
+                    process.terminate()
                     break
                 
                 line = line.strip()
                 if not line:
                     continue
                 
-                # print(f"[WHISPER] {line}")  # 減少 Debug 輸出以免洗版
-                transcript_lines.append(line)
-                
                 # 解析時間戳來估計進度 [00:00:00.000 --> 00:00:05.000]
-                if '-->' in line and progress_callback and total_duration > 0:
+                if track_progress and line.startswith('[') and '-->' in line:
                     try:
-                        # 提取結束時間
-                        import re
-                        match = re.search(r'\[(\d+):(\d+):(\d+)', line)
-                        if match:
-                            h, m, s = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                            current_seconds = h * 3600 + m * 60 + s
-                            
-                            # 精確計算進度
-                            progress = min(current_seconds / total_duration, 0.99)
-                            progress_callback(progress)
+                        # 時間戳格式固定為 [HH:MM:SS.mmm，直接以切片取出時、分、秒
+                        current_seconds = int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+                        
+                        # 精確計算進度
+                        progress = min(current_seconds / total_duration, 0.99)
+                        progress_callback(progress)
                     except:
                         pass
                 
@@ -413,10 +439,10 @@ class TranscriptionCore:
                 if 'whisper_print_timings' in line and progress_callback:
                     progress_callback(1.0)
             
-            self._process.wait()
+            process.wait()
             
-            if self._process.returncode != 0:
-                raise RuntimeError(f"Whisper 返回錯誤碼：{self._process.returncode}")
+            if process.returncode != 0:
+                raise RuntimeError(f"Whisper 返回錯誤碼：{process.returncode}")
             
             # 讀取輸出檔案
             transcript_text = ""
@@ -444,24 +470,22 @@ class TranscriptionCore:
     
     def _convert_to_traditional(self, text: str) -> str:
         """將文字轉換為繁體中文"""
-        if not self._opencc_converter or not text:
+        if not text:
+            return text
+        
+        converter = _get_opencc_converter('s2t')  # 簡體轉繁體
+        if not converter:
             return text
         
         try:
-            return self._opencc_converter.convert(text)
+            return converter.convert(text)
         except Exception:
             return text
     
-    def _convert_file_to_traditional(self, file_path: str):
-        """將檔案內容轉換為繁體中文"""
-        if not self._opencc_converter:
-            return
-        
+    def _write_output_file(self, file_path: str, content: str):
+        """以單次寫入覆寫輸出檔案內容"""
         try:
-            path = Path(file_path)
-            content = path.read_text(encoding='utf-8')
-            converted = self._opencc_converter.convert(content)
-            path.write_text(converted, encoding='utf-8')
+            Path(file_path).write_text(content, encoding='utf-8')
         except Exception:
             pass
     